@@ -12,6 +12,7 @@
 Throughput test: 6m 25s @ 1M rows / 150 keys / 1.5GB
 NOTE: This is naive and will vary drastically based on network speed, for example on a GCP VM.
 """
+import mmap
 import os
 from io import BytesIO
 from multiprocessing import Process
@@ -34,7 +35,7 @@ from target_bigquery.core import (
 
 class Job(NamedTuple):
     table: str
-    data: Union[bytes, memoryview]
+    data: Union[bytes, memoryview, mmap.mmap]
     config: Dict[str, Any]
     attempt: int = 1
 
@@ -53,9 +54,13 @@ class BatchJobWorker(BaseWorker):
             if job is None:
                 break
             try:
+                # An mmap is already a readable file object, so only wrap other buffers.
+                # Passing the size lets small payloads go out as a single multipart upload.
                 client.load_table_from_file(
-                    BytesIO(job.data),
+                    job.data if isinstance(job.data, mmap.mmap) else BytesIO(job.data),
                     job.table,
+                    rewind=True,
+                    size=len(job.data),
                     num_retries=3,
                     job_config=bigquery.LoadJobConfig(**job.config),
                 ).result()
@@ -86,6 +91,7 @@ class BatchJobProcessWorker(BatchJobWorker, Process):
 
 class BigQueryBatchJobSink(BaseBigQuerySink):
     MAX_WORKERS = os.cpu_count() * 2
+    MAX_JOBS_QUEUED = MAX_WORKERS * 2
     WORKER_CAPACITY_FACTOR = 1
     WORKER_CREATION_MIN_INTERVAL = 10.0
 
@@ -113,7 +119,7 @@ class BigQueryBatchJobSink(BaseBigQuerySink):
 
     def process_batch(self, context: Dict[str, Any]) -> None:
         self.buffer.close()
-        self.global_queue.put(
+        self.enqueue_job(
             Job(
                 data=(
                     self.buffer.getvalue()
@@ -124,7 +130,6 @@ class BigQueryBatchJobSink(BaseBigQuerySink):
                 config=self.job_config,
             ),
         )
-        self.increment_jobs_enqueued()
         self.buffer = Compressor()
 
 
@@ -12,9 +12,11 @@ import datetime
 import gzip
 import json
 import mmap
+import queue
 import re
 import shutil
 import sys
+import threading
 import time
 import traceback
 from abc import ABC, abstractmethod
@@ -79,6 +81,10 @@ class SchemaResolverVersion(Enum):
         return str(self.value)
 
 
+_DATASETS: Dict[Tuple[str, str], bigquery.Dataset] = {}
+"""Datasets created or fetched by BigQueryTable.create_table keyed on (project, dataset)."""
+
+
 @dataclass
 class BigQueryTable:
     name: str
@@ -128,7 +134,9 @@ class BigQueryTable:
 
     def as_ref(self) -> bigquery.TableReference:
         """Returns a TableReference for this table."""
-        return bigquery.TableReference.from_string(str(self))
+        if not hasattr(self, "_table_ref"):
+            self._table_ref = bigquery.TableReference(self.as_dataset_ref(), self.name)
+        return self._table_ref
 
     def as_dataset_ref(self) -> bigquery.DatasetReference:
         """Returns a DatasetReference for this table."""
@@ -166,19 +174,25 @@ class BigQueryTable:
         table in a single method call. It is idempotent and will not create
         a new table if one already exists."""
         if not hasattr(self, "_dataset"):
-            try:
-                self._dataset = client.create_dataset(
-                    self.as_dataset(**kwargs["dataset"]), exists_ok=False
-                )
-            except Conflict:
-                dataset = client.get_dataset(self.as_dataset(**kwargs["dataset"]))
-                if dataset.location != kwargs["dataset"]["location"]:
-                    raise Exception(
-                        f"Location of existing dataset {dataset.dataset_id} ({dataset.location}) "
-                        f"does not match specified location: {kwargs['dataset']['location']}"
+            # Every table of a stream shares the dataset, so it is only created or
+            # fetched from BigQuery once per process
+            dataset_key = (self.project, self.dataset)
+            if dataset_key not in _DATASETS:
+                try:
+                    _DATASETS[dataset_key] = client.create_dataset(
+                        self.as_dataset(**kwargs["dataset"]), exists_ok=False
                     )
-                else:
-                    self._dataset = dataset
+                except Conflict:
+                    dataset = client.get_dataset(self.as_dataset(**kwargs["dataset"]))
+                    if dataset.location != kwargs["dataset"]["location"]:
+                        raise Exception(
+                            f"Location of existing dataset {dataset.dataset_id}"
+                            f" ({dataset.location}) does not match specified location:"
+                            f" {kwargs['dataset']['location']}"
+                        )
+                    else:
+                        _DATASETS[dataset_key] = dataset
+            self._dataset = _DATASETS[dataset_key]
         if not hasattr(self, "_table"):
             try:
                 self._table = client.create_table(
@@ -219,7 +233,10 @@ class BigQueryTable:
         return {"location": "US"}
 
     def __hash__(self) -> int:
-        return hash((self.name, self.dataset, self.project, json.dumps(self.jsonschema)))
+        if not hasattr(self, "_hash"):
+            # The schema dump dominates the cost, compute the canonical key once
+            self._hash = hash((self.name, self.dataset, self.project, json.dumps(self.jsonschema)))
+        return self._hash
 
 
 @dataclass
@@ -275,6 +292,8 @@ class BaseBigQuerySink(BatchSink):
 
     include_sdc_metadata_properties: bool = True
     ingestion_strategy = IngestionStrategy.FIXED
+    MAX_JOBS_QUEUED = 30
+    """Maximum number of jobs in the global queue before enqueueing blocks."""
 
     def __init__(
         self,
@@ -285,6 +304,10 @@ class BaseBigQuerySink(BatchSink):
     ) -> None:
         """Initialize the sink."""
         super().__init__(target, stream_name, schema, key_properties)
+        # Validated up front, a value below 1 would block `enqueue_job` forever
+        self.max_jobs_queued = positive_int_option(
+            self.config, "max_jobs_queued", self.MAX_JOBS_QUEUED
+        )
         self._credentials = BigQueryCredentials(
             self.config.get("credentials_path"),
             self.config.get("credentials_json"),
@@ -351,6 +374,33 @@ class BaseBigQuerySink(BatchSink):
         self.global_par_typ = target.par_typ
         self.global_queue = target.queue
         self.increment_jobs_enqueued = target.increment_jobs_enqueued
+        self.get_jobs_enqueued = target.get_jobs_enqueued
+        self.service_worker_pool = target.service_worker_pool
+
+    def queue_at_capacity(self) -> bool:
+        """Whether the global queue holds `max_jobs_queued` jobs or more."""
+        try:
+            queued = self.global_queue.qsize()
+        except NotImplementedError:
+            # multiprocessing queues do not implement qsize on macOS, fall back
+            # to the number of jobs which workers have not reported as done
+            queued = self.get_jobs_enqueued()
+        return queued >= self.max_jobs_queued
+
+    def enqueue_job(self, job: Any) -> None:
+        """Put a job on the global queue for the worker pool.
+
+        Blocks while the queue is at capacity so buffered batches cannot pile up in memory
+        faster than the workers drain them."""
+        if self.queue_at_capacity():
+            self.logger.warning("Max jobs enqueued reached (%s), waiting", self.max_jobs_queued)
+            while self.queue_at_capacity():
+                # Keep the pool alive and surface worker errors while waiting, otherwise
+                # dead workers would leave us waiting on a queue nobody drains
+                self.service_worker_pool()
+                time.sleep(0.1)
+        self.global_queue.put(job)
+        self.increment_jobs_enqueued()
 
     def _is_upsert_candidate(self) -> bool:
         """Determine if this stream is an upsert candidate based on user configuration."""
@@ -427,6 +477,29 @@ class BaseBigQuerySink(BatchSink):
     def _validate_and_parse(self, record: dict) -> dict:
         return record
 
+    def start_batch(self, context: Dict[str, Any]) -> None:
+        """Start a new batch. Formats the batch invariant _sdc_batched_at timestamp once."""
+        context["_sdc_batched_at"] = (
+            context.get("batch_start_time") or datetime.datetime.now()
+        ).isoformat()
+
+    def _add_sdc_metadata_to_record(
+        self, record: Dict[str, Any], message: Dict[str, Any], context: Dict[str, Any]
+    ) -> None:
+        """Populate metadata _sdc columns from incoming record message.
+
+        This override reuses the _sdc_batched_at timestamp formatted in `start_batch` instead
+        of constructing and formatting it for every record in the batch. _sdc_received_at stays
+        per record, upsert dedupe orders on it when the tap does not send time_extracted."""
+        # Mirrors `Sink._add_sdc_metadata_to_record` of the pinned singer-sdk (0.22.x),
+        # revisit when bumping singer-sdk
+        record["_sdc_extracted_at"] = message.get("time_extracted")
+        record["_sdc_received_at"] = datetime.datetime.now().isoformat()
+        record["_sdc_batched_at"] = context["_sdc_batched_at"]
+        record["_sdc_deleted_at"] = record.get("_sdc_deleted_at")
+        record["_sdc_sequence"] = int(round(time.time() * 1000))
+        record["_sdc_table_version"] = message.get("version")
+
     def preprocess_record(self, record: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         """Preprocess a record before writing it to the sink."""
         metadata = {
@@ -546,6 +619,13 @@ class Denormalized:
 
     ingestion_strategy = IngestionStrategy.DENORMALIZED
 
+    def __init__(self: BaseBigQuerySink, *args, **kwargs) -> None:
+        """Initialize the sink and specialize `preprocess_record` for the configured transforms."""
+        super().__init__(*args, **kwargs)
+        if not self.table.transforms:
+            # Without column name transforms the translator is a no-op, so skip it entirely
+            self.preprocess_record = self._preprocess_record_passthrough
+
     @retry(
         retry=retry_if_exception_type(ConnectionError),
         stop=stop_after_attempt(3),
@@ -556,9 +636,10 @@ class Denormalized:
         """Update the target schema."""
         table = self.table.as_table()
         current_schema = table.schema[:]
+        current_names = {field.name for field in current_schema}
         mut_schema = table.schema[:]
         for expected_field in self.table.get_resolved_schema(self.apply_transforms):
-            if not any(field.name == expected_field.name for field in current_schema):
+            if expected_field.name not in current_names:
                 mut_schema.append(expected_field)
         if len(mut_schema) > len(current_schema):
             table.schema = mut_schema
@@ -574,6 +655,12 @@ class Denormalized:
         """Preprocess a record before writing it to the sink."""
         return self.table.schema_translator.translate_record(record)
 
+    def _preprocess_record_passthrough(
+        self: BaseBigQuerySink, record: Dict[str, Any], context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Preprocess a record for a sink without column name transforms."""
+        return record
+
 
 @contextmanager
 def augmented_syspath(new_paths: Optional[Iterable[str]] = None):
@@ -626,6 +713,14 @@ def storage_client_factory(
         )
     return bigquery_storage_v1.BigQueryWriteClient()
 
+
+def positive_int_option(config: Dict[str, Any], name: str, default: int) -> int:
+    """Get an integer from the `options` config which must be at least 1."""
+    value = config.get("options", {}).get(name, default)
+    if value < 1:
+        raise ValueError(f"options.{name} must be at least 1, got {value}")
+    return value
+
 @dataclass
 class _FieldProjection:
     projection: str
@@ -656,6 +751,10 @@ class SchemaTranslator:
         # Used by the denormalized strategy where we eagerly transform
         # the target schema
         self._translated_schema_transformed = None
+        # Used by translate_record, record keys are transformed without quotes
+        # and memoized as the same handful of keys appear in every record
+        self._record_transforms = {**transforms, "quote": False}
+        self._record_keys: Dict[str, str] = {}
 
     @property
     def translated_schema(self) -> List[SchemaField]:
@@ -683,19 +782,19 @@ class SchemaTranslator:
         """Translate a record using the SchemaTranslator `transforms`."""
         if not self.transforms:
             return record
-        output = dict(
-            [
-                (transform_column_name(k, **{**self.transforms, "quote": False}), v)
-                for k, v in record.items()
-            ]
-        )
-        for k, v in output.items():
-            if isinstance(v, list):
-                for i, inner in enumerate(v):
-                    if isinstance(inner, dict):
-                        output[k][i] = self.translate_record(inner)
+        output = {}
+        for k, v in record.items():
+            key = self._record_keys.get(k)
+            if key is None:
+                key = self._record_keys[k] = transform_column_name(k, **self._record_transforms)
             if isinstance(v, dict):
-                output[k] = self.translate_record(v)
+                v = self.translate_record(v)
+            elif isinstance(v, list):
+                v = [
+                    self.translate_record(inner) if isinstance(inner, dict) else inner
+                    for inner in v
+                ]
+            output[key] = v
         return output
 
     def generate_view_statement(self, table_name: BigQueryTable) -> str:
@@ -899,13 +998,27 @@ class SchemaTranslator:
 
 
 class Compressor:
-    """Compresses streams of bytes using gzip."""
+    """Compresses streams of bytes using gzip.
+
+    When a gzip binary is available, compression runs in a subprocess concurrently with the
+    serialization of records on the calling thread. Otherwise it runs in-process via GzipFile.
+    Either way, coalesced writes are handed to gzip by a background thread so the caller keeps
+    reading records while a write blocks on the pipe or on zlib."""
+
+    FLUSH_THRESHOLD = 1024 * 1024
+    """Pending bytes coalesced in memory before they are written to gzip in a single call."""
+    MAX_QUEUED_WRITES = 4
+    """Coalesced writes waiting on the writer thread before `write` blocks."""
 
     def __init__(self) -> None:
         """Initialize the compressor."""
         self._compressor = None
         self._closed = False
+        self._pending: List[bytes] = []
+        self._pending_size = 0
         if shutil.which("gzip") is not None:
+            # Spill to a local file which gzip writes to directly, the compressed batch
+            # never passes through this process until a worker maps it for upload
             self._buffer = TemporaryFile()
             self._compressor = Popen(["gzip", "-"], stdin=PIPE, stdout=self._buffer)
             if self._compressor.stdin is None:
@@ -914,15 +1027,67 @@ class Compressor:
         else:
             self._buffer = BytesIO()
             self._gzip = gzip.GzipFile(fileobj=self._buffer, mode="wb")
+        self._writes: "queue.Queue[Optional[bytes]]" = queue.Queue(self.MAX_QUEUED_WRITES)
+        self._writer_errors: List[BaseException] = []
+        # The thread is started on the first coalesced write and must not reference self,
+        # otherwise an unclosed compressor would never be collected and `__del__` never runs
+        self._writer: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _write_loop(
+        writes: "queue.Queue[Optional[bytes]]", stream: IO[bytes], errors: List[BaseException]
+    ) -> None:
+        """Write queued data to the stream until the None sentinel is received."""
+        while True:
+            data = writes.get()
+            try:
+                if data is None:
+                    return
+                if not errors:
+                    stream.write(data)
+            except BaseException as exc:
+                # Surface the error on the caller's thread, keep draining so it never blocks
+                errors.append(exc)
+            finally:
+                writes.task_done()
+
+    def _raise_writer_error(self) -> None:
+        """Re-raise an error from the writer thread on the calling thread."""
+        if self._writer_errors:
+            raise self._writer_errors[0]
 
     def write(self, data: bytes) -> None:
-        """Write data to the compressor."""
+        """Write data to the compressor.
+
+        Small writes are coalesced and handed to gzip once `FLUSH_THRESHOLD` bytes are pending
+        which avoids a pipe write (or GzipFile call) per record."""
         if self._closed:
             raise ValueError("I/O operation on closed compressor.")
-        self._gzip.write(data)
+        self._pending.append(data)
+        self._pending_size += len(data)
+        if self._pending_size >= self.FLUSH_THRESHOLD:
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        """Queue all pending data to be written to gzip in a single call."""
+        self._raise_writer_error()
+        if self._pending:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop,
+                    args=(self._writes, self._gzip, self._writer_errors),
+                    daemon=True,
+                )
+                self._writer.start()
+            self._writes.put(b"".join(self._pending))
+            self._pending = []
+            self._pending_size = 0
 
     def flush(self) -> None:
         """Flush the compressor buffer."""
+        self._write_pending()
+        self._writes.join()
+        self._raise_writer_error()
         self._gzip.flush()
         self._buffer.flush()
 
@@ -930,12 +1095,21 @@ class Compressor:
         """Close the compressor and wait for the gzip process to finish."""
         if self._closed:
             return
+        # Mark closed first so a failed close is not retried by `__del__` against a stream
+        # that already raised
+        self._closed = True
+        try:
+            self._write_pending()
+        finally:
+            if self._writer is not None and self._writer.is_alive():
+                self._writes.put(None)
+                self._writer.join()
+        self._raise_writer_error()
         self._gzip.close()
         if self._compressor is not None:
             self._compressor.wait()
         self._buffer.flush()
         self._buffer.seek(0)
-        self._closed = True
 
     def getvalue(self) -> bytes:
         """Return the compressed buffer as a bytes object."""
@@ -975,27 +1149,33 @@ class Compressor:
         self._buffer = None
 
 
-# pylint: disable=no-else-return,too-many-branches,too-many-return-statements
+FORMAT_TYPES = {"date-time": "timestamp", "date": "date", "time": "time"}
+"""BigQuery types for JSON schema string formats, a known format takes priority over the type."""
+
+RANKED_TYPES = (
+    ("number", "float"),
+    ("integer", "integer"),
+    ("boolean", "boolean"),
+    ("object", "record"),
+)
+"""JSON schema types and their BigQuery types in order of priority, anything else is a string."""
+
+
 def bigquery_type(property_type: List[str], property_format: Optional[str] = None) -> str:
     """Convert a JSON Schema type to a BigQuery type."""
-    if property_format == "date-time":
-        return "timestamp"
-    if property_format == "date":
-        return "date"
-    elif property_format == "time":
-        return "time"
-    elif "number" in property_type:
-        return "float"
-    elif "integer" in property_type and "string" in property_type:
-        return "string"
-    elif "integer" in property_type:
-        return "integer"
-    elif "boolean" in property_type:
-        return "boolean"
-    elif "object" in property_type:
-        return "record"
-    else:
+    if property_format in FORMAT_TYPES:
+        return FORMAT_TYPES[property_format]
+    types = {property_type} if isinstance(property_type, str) else set(property_type)
+    if "number" not in types and "integer" in types and "string" in types:
         return "string"
+    for json_type, bq_type in RANKED_TYPES:
+        if json_type in types:
+            return bq_type
+    return "string"
+
+
+SNAKE_CASE_PATTERN = re.compile("((?!^)(?<!_)[A-Z][a-z]+|(?<=[a-z0-9])[A-Z])")
+"""Matches the word boundaries where an underscore is inserted when snake casing a name."""
 
 
 # Column name transforms are configurable and entirely opt-in.
@@ -1016,12 +1196,12 @@ def transform_column_name(
     was_quoted = name.startswith("`") and name.endswith("`")
     name = name.strip("`")
     if snake_case:
-        name = re.sub("((?!^)(?<!_)[A-Z][a-z]+|(?<=[a-z0-9])[A-Z])", r"_\1", name)
+        name = SNAKE_CASE_PATTERN.sub(r"_\1", name)
     if lower:
-        name = "{}".format(name).lower()
+        name = name.lower()
     if add_underscore_when_invalid:
         if name[0].isdigit():
-            name = "_{}".format(name)
+            name = f"_{name}"
     if quote or was_quoted:
-        name = "`{}`".format(name)
+        name = f"`{name}`"
     return name
@@ -13,9 +13,7 @@ Throughput test: 6m 30s @ 1M rows / 150 keys / 1.5GB
 NOTE: This is naive and will vary drastically based on network speed, for example on a GCP VM.
 """
 import os
-import shutil
 import time
-from io import BytesIO
 from multiprocessing import Process
 from multiprocessing.connection import Connection
 from multiprocessing.dummy import Process as _Thread
@@ -30,7 +28,6 @@ from target_bigquery.constants import DEFAULT_BUCKET_PATH
 from target_bigquery.core import (
     BaseBigQuerySink,
     BaseWorker,
-    BigQueryCredentials,
     Compressor,
     Denormalized,
     ParType,
@@ -41,6 +38,11 @@ from target_bigquery.core import (
 if TYPE_CHECKING:
     from target_bigquery.target import TargetBigQuery
 
+# Stream specific constant
+UPLOAD_CHUNK_SIZE = 40 * 256 * 1024
+"""Size of each resumable upload chunk (10MiB), the buffer is written to the blob in slices of
+this size. GCS requires resumable upload chunks to be a multiple of 256KiB."""
+
 
 class Job(NamedTuple):
     """Job to be processed by a worker."""
@@ -79,13 +81,16 @@ class GcsStagingWorker(BaseWorker):
                 blob = storage.Blob.from_string(path, client=client)
                 # TODO: pass in timeout?
                 # TODO: composite uploads
-                with blob.open(
+                # Write zero-copy slices of the buffer so at most one chunk is held by the
+                # blob writer rather than a full copy of the compressed batch
+                with memoryview(job.buffer) as view, blob.open(
                     "wb",
                     if_generation_match=0,
-                    chunk_size=1024 * 1024 * 10,
+                    chunk_size=UPLOAD_CHUNK_SIZE,
                     timeout=300,
                 ) as fh:
-                    shutil.copyfileobj(BytesIO(job.buffer), fh)
+                    for offset in range(0, len(view), UPLOAD_CHUNK_SIZE):
+                        fh.write(view[offset : offset + UPLOAD_CHUNK_SIZE])
                 job.gcs_notifier.send(path)
             except Exception as exc:
                 job.attempt += 1
@@ -114,6 +119,7 @@ class GcsStagingProcessWorker(GcsStagingWorker, Process):
 
 class BigQueryGcsStagingSink(BaseBigQuerySink):
     MAX_WORKERS = os.cpu_count() * 2
+    MAX_JOBS_QUEUED = MAX_WORKERS * 2
     WORKER_CAPACITY_FACTOR = 1
     WORKER_CREATION_MIN_INTERVAL = 10.0
 
@@ -126,18 +132,11 @@ class BigQueryGcsStagingSink(BaseBigQuerySink):
     ) -> None:
         super().__init__(target, stream_name, schema, key_properties)
         self.bucket_name = self.config["bucket"]
-        self._credentials = BigQueryCredentials(
-            self.config.get("credentials_path"),
-            self.config.get("credentials_json"),
-            self.config["project"],
-        )
         self.client = gcs_client_factory(self._credentials)
         self.create_bucket_if_not_exists()
         self.buffer = Compressor()
-        self.buffer = Compressor()
         self.gcs_notification, self.gcs_notifier = target.pipe_cls(False)
         self.uris: List[str] = []
-        self.increment_jobs_enqueued = target.increment_jobs_enqueued
 
     @staticmethod
     def worker_cls_factory(
@@ -159,7 +158,7 @@ class BigQueryGcsStagingSink(BaseBigQuerySink):
 
     def process_batch(self, context: Dict[str, Any]) -> None:
         self.buffer.close()
-        self.global_queue.put(
+        self.enqueue_job(
             Job(
                 buffer=(
                     self.buffer.getvalue()
@@ -173,7 +172,6 @@ class BigQueryGcsStagingSink(BaseBigQuerySink):
                 gcs_notifier=self.gcs_notifier,
             ),
         )
-        self.increment_jobs_enqueued()
         self.buffer = Compressor()
 
     def clean_up(self) -> None:
@@ -13,7 +13,6 @@ Throughput test: 11m 0s @ 1M rows / 150 keys / 1.5GB
 NOTE: This is naive and will vary drastically based on network speed, for example on a GCP VM.
 """
 import os
-from time import sleep
 from multiprocessing import Process
 from multiprocessing.connection import Connection
 from multiprocessing.dummy import Process as _Thread
@@ -52,6 +51,9 @@ logger = logging.getLogger(__name__)
 # Stream specific constant
 MAX_IN_FLIGHT = 15
 """Maximum number of concurrent requests per worker be processed by grpc before awaiting."""
+MAX_REQUEST_SIZE = 9 * 1024 * 1024
+"""Maximum bytes of serialized rows per AppendRows request, below the API's 10MB request limit
+to leave headroom for the writer schema and request metadata."""
 
 Dispatcher = Callable[[types.AppendRowsRequest], writer.AppendRowsFuture]
 StreamComponents = Tuple[str, writer.AppendRowsStream, Dispatcher]
@@ -307,24 +309,28 @@ class BigQueryStorageWriteSink(BaseBigQuerySink):
         return self._proto_schema
 
     def start_batch(self, context: Dict[str, Any]) -> None:
+        super().start_batch(context)
         self.proto_rows = types.ProtoRows()
+        self.proto_rows_size = 0
 
     def preprocess_record(self, record: dict, context: dict) -> dict:
         record = super().preprocess_record(record, context)
-        record["data"] = orjson.dumps(record["data"]).decode("utf-8")
+        record["data"] = orjson.dumps(record["data"]).decode()
         return record
 
     def process_record(self, record: Dict[str, Any], context: Dict[str, Any]) -> None:
-        self.proto_rows.serialized_rows.append(
-            json_format.ParseDict(record, self.proto_schema()).SerializeToString()
-        )
+        row = json_format.ParseDict(record, self.proto_schema()).SerializeToString()
+        if self.proto_rows_size + len(row) > MAX_REQUEST_SIZE and self.proto_rows.serialized_rows:
+            # Ship what we have so a large batch is split into several AppendRows requests
+            # rather than one which exceeds the request size limit
+            self.process_batch(context)
+            self.proto_rows = types.ProtoRows()
+            self.proto_rows_size = 0
+        self.proto_rows.serialized_rows.append(row)
+        self.proto_rows_size += len(row)
 
     def process_batch(self, context: Dict[str, Any]) -> None:
-        while self.global_queue.qsize() >= self.MAX_JOBS_QUEUED:
-            self.logger.warn(f"Max jobs enqueued reached ({self.MAX_JOBS_QUEUED})")
-            sleep(1)
-        
-        self.global_queue.put(
+        self.enqueue_job(
             Job(
                 parent=self.parent,
                 template=self.template,
@@ -332,7 +338,6 @@ class BigQueryStorageWriteSink(BaseBigQuerySink):
                 stream_notifier=self.stream_notifier,
             )
         )
-        self.increment_jobs_enqueued()
 
     def commit_streams(self) -> None:
         while self.stream_notification.poll():
@@ -13,17 +13,63 @@ Throughput test: ...slower than all other methods, no test results available.
 NOTE: This is naive and will vary drastically based on network speed, for example on a GCP VM.
 """
 import os
+import uuid
 from multiprocessing import Process
 from multiprocessing.dummy import Process as _Thread
 from queue import Empty
-from typing import Any, Dict, List, NamedTuple, Optional, Type, Union
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Type, Union
 
 import orjson
 from google.api_core.exceptions import GatewayTimeout, NotFound
-from google.cloud import _http, bigquery
+from google.api_core.retry import Retry
+from google.cloud import bigquery
 from tenacity import retry, retry_if_exception_type, stop_after_delay, wait_fixed
 
-from target_bigquery.core import BaseBigQuerySink, BaseWorker, Denormalized, bigquery_client_factory
+from target_bigquery.core import (
+    BaseBigQuerySink,
+    BaseWorker,
+    Denormalized,
+    bigquery_client_factory,
+    positive_int_option,
+)
+
+if TYPE_CHECKING:
+    from target_bigquery.target import TargetBigQuery
+
+# Stream specific constant
+MAX_ROWS_PER_REQUEST = 500
+"""Default number of rows sent per insertAll request, the size BigQuery recommends."""
+
+
+def insert_rows(
+    client: bigquery.Client,
+    table: bigquery.TableReference,
+    rows: List[Dict[str, Any]],
+    rpc_retry: Retry = bigquery.DEFAULT_RETRY,
+) -> List[Dict[str, Any]]:
+    """Stream rows into a table via the insertAll API.
+
+    Equivalent to `Client.insert_rows_json` with generated insert IDs except the request body
+    is serialized in one orjson call instead of by the stdlib json encoder. Requests are
+    retried with `rpc_retry` like the client does. Returns the insert errors reported by
+    BigQuery, if any, as mappings of the row "index" to its "errors"."""
+    path = f"{table.path}/insertAll"
+    response = client._call_api(
+        rpc_retry,
+        span_name="BigQuery.insertRowsJson",
+        span_attributes={"path": path},
+        method="POST",
+        path=path,
+        data=orjson.dumps(
+            {"rows": [{"insertId": str(uuid.uuid4()), "json": row} for row in rows]}
+        ),
+        content_type="application/json",
+        timeout=None,
+    )
+    return [
+        {"index": int(error["index"]), "errors": error["errors"]}
+        for error in response.get("insertErrors", ())
+    ]
 
 
 class Job(NamedTuple):
@@ -39,8 +85,6 @@ class StreamingInsertWorker(BaseWorker):
 
     def run(self) -> None:
         """Run the worker."""
-        # A monkey patch since we can't override the default json encoder...
-        _http.json = orjson
         client: bigquery.Client = bigquery_client_factory(self.credentials)
         while True:
             try:
@@ -51,14 +95,14 @@ class StreamingInsertWorker(BaseWorker):
                 break
             try:
                 _ = retry(
-                    client.insert_rows_json,
+                    insert_rows,
                     retry=retry_if_exception_type(
                         (ConnectionError, TimeoutError, NotFound, GatewayTimeout)
                     ),
                     wait=wait_fixed(1),
                     stop=stop_after_delay(10),
                     reraise=True,
-                )(table=job.table, json_rows=job.records)
+                )(client, table=job.table, rows=job.records)
             except Exception as exc:
                 job.attempt += 1
                 if job.attempt > 3:
@@ -87,8 +131,23 @@ class StreamingInsertProcessWorker(StreamingInsertWorker, Process):
 class BigQueryStreamingInsertSink(BaseBigQuerySink):
     MAX_WORKERS = os.cpu_count() * 2
     WORKER_CAPACITY_FACTOR = 10
+    MAX_JOBS_QUEUED = MAX_WORKERS * WORKER_CAPACITY_FACTOR
     WORKER_CREATION_MIN_INTERVAL = 1.0
 
+    def __init__(
+        self,
+        target: "TargetBigQuery",
+        stream_name: str,
+        schema: Dict[str, Any],
+        key_properties: Optional[List[str]],
+    ) -> None:
+        # Maximum number of rows per insertAll request, validated before any table work
+        # so a bad config fails before a batch is read
+        self.chunk_size = positive_int_option(
+            target.config, "streaming_insert_chunk_size", MAX_ROWS_PER_REQUEST
+        )
+        super().__init__(target, stream_name, schema, key_properties)
+
     @staticmethod
     def worker_cls_factory(
         worker_executor_cls: Type[Process], config: Dict[str, Any]
@@ -98,19 +157,19 @@ class BigQueryStreamingInsertSink(BaseBigQuerySink):
 
     def preprocess_record(self, record: dict, context: dict) -> dict:
         record = super().preprocess_record(record, context)
-        record["data"] = orjson.dumps(record["data"]).decode("utf-8")
+        record["data"] = orjson.dumps(record["data"]).decode()
         return record
 
-    @property
-    def max_size(self) -> int:
-        return min(super().max_size, 500)
-
     def process_record(self, record: Dict[str, Any], context: Dict[str, Any]) -> None:
         self.records_to_drain.append(record)
 
     def process_batch(self, context: Dict[str, Any]) -> None:
-        self.global_queue.put(Job(table=self.table.as_ref(), records=self.records_to_drain.copy()))
-        self.increment_jobs_enqueued()
+        # Split the batch into request sized jobs so the worker pool inserts them concurrently
+        table = self.table.as_ref()
+        for i in range(0, len(self.records_to_drain), self.chunk_size):
+            self.enqueue_job(
+                Job(table=table, records=self.records_to_drain[i : i + self.chunk_size])
+            )
         self.records_to_drain = []
 
 
@@ -235,6 +235,26 @@ class TargetBigQuery(Target):
                         " This sets an override for maximum number of workers in the pool."
                     ),
                 ),
+                th.Property(
+                    "max_jobs_queued",
+                    th.IntegerType,
+                    required=False,
+                    description=(
+                        "By default, each sink type has a preconfigured limit on the number of"
+                        " jobs waiting for the worker pool. Once reached, the target blocks until"
+                        " workers catch up. This sets an override for that limit."
+                    ),
+                ),
+                th.Property(
+                    "streaming_insert_chunk_size",
+                    th.IntegerType,
+                    required=False,
+                    description=(
+                        "Maximum number of rows sent in a single insertAll request by the"
+                        " streaming_insert load method. Batches are split into requests of this"
+                        " size which are sent concurrently by the worker pool. Defaults to 500."
+                    ),
+                ),
             ),
             description=(
                 "Accepts a JSON object of options with boolean values to enable them. These are"
@@ -335,11 +355,11 @@ class TargetBigQuery(Target):
             self.config["project"],
         )
 
+        # All sinks share one worker pool so the worker class is resolved once up front
+        worker_cls = self.get_sink_class().worker_cls_factory(self.proc_cls, self.config)
+
         def worker_factory():
-            return self.get_sink_class().worker_cls_factory(
-                self.proc_cls,
-                self.config,
-            )(
+            return worker_cls(
                 ext_id=uuid.uuid4().hex,
                 queue=self.queue,
                 credentials=self._credentials,
@@ -358,6 +378,10 @@ class TargetBigQuery(Target):
         """Increment the number of jobs enqueued."""
         self._jobs_enqueued += 1
 
+    def get_jobs_enqueued(self) -> int:
+        """Return the number of jobs enqueued which workers have not yet reported as done."""
+        return self._jobs_enqueued
+
     # We can expand this to support other parallelization methods in the future.
     # We woulod approach this by adding a new ParType enum and interpreting the
     # the Process, Pipe, and Queue classes as protocols which can be duck-typed.
@@ -486,9 +510,11 @@ class TargetBigQuery(Target):
             return self.add_sink(stream_name, schema, key_properties)
         return existing_sink
 
-    def drain_one(self, sink: Sink) -> None:  # type: ignore
-        """Drain a sink. Includes a hook to manage the worker pool and notifications."""
-        #self.logger.info(f"Jobs queued : {self.queue.qsize()} | Max nb jobs queued : {os.cpu_count() * 4} | Nb workers : {len(self.workers)} | Max nb workers : {os.cpu_count() * 2}")
+    def service_worker_pool(self, drain_on_error: bool = False) -> None:
+        """Right-size the worker pool and process pending worker notifications.
+
+        Raises a RuntimeError if a worker reported an error and fail_fast is enabled. If
+        drain_on_error is set, all sinks are drained on a best effort basis before raising."""
         self.resize_worker_pool()
         while self.job_notification.poll():
             ext_id = self.job_notification.recv()
@@ -501,17 +527,23 @@ class TargetBigQuery(Target):
             e, msg = self.error_notification.recv()
             if self.config.get("fail_fast", True):
                 self.logger.error(msg)
-                try:
-                    # Try to drain if we can. This is a best effort.
-                    # TODO: we should consider if draining here is the right thing
-                    # to do. It's _possible_ we increment the state message when
-                    # data is not actually written. Its _unlikely_ so the upside is
-                    # greater than the downside for now but will revisit this.
-                    self.logger.error("Draining all sinks and terminating.")
-                    self.drain_all(is_endofpipe=True)
-                except Exception:
-                    self.logger.error("Drain failed.")
+                if drain_on_error:
+                    try:
+                        # Try to drain if we can. This is a best effort.
+                        # TODO: we should consider if draining here is the right thing
+                        # to do. It's _possible_ we increment the state message when
+                        # data is not actually written. Its _unlikely_ so the upside is
+                        # greater than the downside for now but will revisit this.
+                        self.logger.error("Draining all sinks and terminating.")
+                        self.drain_all(is_endofpipe=True)
+                    except Exception:
+                        self.logger.error("Drain failed.")
                 raise RuntimeError(msg) from e
+
+    def drain_one(self, sink: Sink) -> None:  # type: ignore
+        """Drain a sink. Includes a hook to manage the worker pool and notifications."""
+        #self.logger.info(f"Jobs queued : {self.queue.qsize()} | Max nb jobs queued : {os.cpu_count() * 4} | Nb workers : {len(self.workers)} | Max nb workers : {os.cpu_count() * 2}")
+        self.service_worker_pool(drain_on_error=True)
         super().drain_one(sink)
 
     def drain_all(self, is_endofpipe: bool = False) -> None:  # type: ignore
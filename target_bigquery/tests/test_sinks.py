@@ -0,0 +1,214 @@
+import logging
+import math
+from queue import Queue
+from typing import Any, Type
+from unittest import mock
+
+import orjson
+import pytest
+from google.api_core.exceptions import ServiceUnavailable
+from google.api_core.retry import Retry
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import bigquery
+from google.cloud.bigquery_storage_v1 import types
+from google.protobuf import struct_pb2
+
+from target_bigquery.batch_job import BigQueryBatchJobSink
+from target_bigquery.core import BaseBigQuerySink
+from target_bigquery.storage_write import BigQueryStorageWriteSink
+from target_bigquery.streaming_insert import BigQueryStreamingInsertSink, insert_rows
+from target_bigquery.target import TargetBigQuery
+
+
+def bare_sink(cls: Type[BaseBigQuerySink], **attrs: Any) -> BaseBigQuerySink:
+    """Build a sink with only the given attributes, skipping __init__ and BigQuery."""
+    sink = cls.__new__(cls)
+    for name, value in attrs.items():
+        setattr(sink, name, value)
+    return sink
+
+
+def test_enqueue_job_blocks_until_workers_drain_the_queue(monkeypatch):
+    monkeypatch.setattr("target_bigquery.core.time.sleep", lambda _: None)
+    queue = Queue()
+    queue.put("queued-1")
+    queue.put("queued-2")
+    serviced = []
+
+    def service_worker_pool():
+        # Simulate a worker picking up a job while the sink waits
+        serviced.append(True)
+        queue.get()
+
+    sink = bare_sink(
+        BigQueryBatchJobSink,
+        max_jobs_queued=2,
+        global_queue=queue,
+        service_worker_pool=service_worker_pool,
+        increment_jobs_enqueued=lambda: None,
+        logger=logging.getLogger(__name__),
+    )
+    sink.enqueue_job("new")
+    assert serviced == [True]
+    assert list(queue.queue) == ["queued-2", "new"]
+
+
+def test_enqueue_job_raises_worker_errors_while_waiting(monkeypatch):
+    monkeypatch.setattr("target_bigquery.core.time.sleep", lambda _: None)
+    queue = Queue()
+    queue.put("queued")
+
+    def service_worker_pool():
+        raise RuntimeError("worker failed")
+
+    sink = bare_sink(
+        BigQueryBatchJobSink,
+        max_jobs_queued=1,
+        global_queue=queue,
+        service_worker_pool=service_worker_pool,
+        logger=logging.getLogger(__name__),
+    )
+    with pytest.raises(RuntimeError, match="worker failed"):
+        sink.enqueue_job("new")
+    assert list(queue.queue) == ["queued"]
+
+
+def test_queue_at_capacity_without_qsize():
+    class NoQsizeQueue(Queue):
+        def qsize(self) -> int:
+            raise NotImplementedError
+
+    sink = bare_sink(BigQueryBatchJobSink, max_jobs_queued=2, global_queue=NoQsizeQueue())
+    sink.get_jobs_enqueued = lambda: 1
+    assert not sink.queue_at_capacity()
+    sink.get_jobs_enqueued = lambda: 2
+    assert sink.queue_at_capacity()
+
+
+@pytest.mark.parametrize("max_jobs_queued", [0, -1])
+def test_sink_rejects_invalid_max_jobs_queued(max_jobs_queued: int):
+    target = TargetBigQuery(
+        config={
+            "project": "project",
+            "dataset": "dataset",
+            "options": {"max_jobs_queued": max_jobs_queued},
+        }
+    )
+    with pytest.raises(ValueError, match="max_jobs_queued"):
+        BigQueryBatchJobSink(target, "stream", {"properties": {}}, None)
+
+
+@pytest.mark.parametrize("fail_fast", [True, False], ids=["fail_fast", "no_fail_fast"])
+def test_service_worker_pool_surfaces_worker_errors(fail_fast: bool):
+    target = TargetBigQuery(
+        config={"project": "project", "dataset": "dataset", "fail_fast": fail_fast}
+    )
+    target.resize_worker_pool = lambda: None
+    target.error_notifier.send((ValueError("boom"), "worker failed"))
+    if fail_fast:
+        with pytest.raises(RuntimeError, match="worker failed"):
+            target.service_worker_pool()
+    else:
+        target.service_worker_pool()
+
+
+def test_insert_rows_posts_orjson_body_and_normalizes_errors():
+    client = bigquery.Client(project="project", credentials=AnonymousCredentials())
+    api_request = mock.Mock(
+        return_value={"insertErrors": [{"index": "1", "errors": [{"reason": "invalid"}]}]}
+    )
+    client._connection.api_request = api_request
+    table = bigquery.TableReference.from_string("project.dataset.table")
+
+    errors = insert_rows(client, table, [{"id": 1}, {"id": 2}])
+
+    assert errors == [{"index": 1, "errors": [{"reason": "invalid"}]}]
+    kwargs = api_request.call_args.kwargs
+    assert kwargs["method"] == "POST"
+    assert kwargs["path"] == "/projects/project/datasets/dataset/tables/table/insertAll"
+    assert kwargs["content_type"] == "application/json"
+    body = orjson.loads(kwargs["data"])
+    assert [row["json"] for row in body["rows"]] == [{"id": 1}, {"id": 2}]
+    insert_ids = [row["insertId"] for row in body["rows"]]
+    assert all(insert_ids) and len(set(insert_ids)) == 2
+
+
+def test_insert_rows_retries_retryable_errors():
+    client = bigquery.Client(project="project", credentials=AnonymousCredentials())
+    client._connection.api_request = mock.Mock(
+        side_effect=[ServiceUnavailable("backendError"), {}]
+    )
+    table = bigquery.TableReference.from_string("project.dataset.table")
+
+    assert insert_rows(client, table, [{"id": 1}], rpc_retry=Retry(initial=0, maximum=0)) == []
+    assert client._connection.api_request.call_count == 2
+
+
+@pytest.mark.parametrize("rows,chunk_size", [(0, 3), (1, 3), (9, 3), (10, 3), (10, 500)])
+def test_streaming_insert_splits_batch_into_chunks(rows: int, chunk_size: int):
+    queue = Queue()
+    records = [{"id": i} for i in range(rows)]
+    table = mock.Mock(as_ref=mock.Mock(return_value="project.dataset.table"))
+    sink = bare_sink(
+        BigQueryStreamingInsertSink,
+        chunk_size=chunk_size,
+        global_queue=queue,
+        max_jobs_queued=100,
+        increment_jobs_enqueued=lambda: None,
+        table=table,
+        records_to_drain=list(records),
+    )
+    sink.process_batch({})
+    jobs = list(queue.queue)
+    assert len(jobs) == math.ceil(rows / chunk_size)
+    assert all(len(job.records) <= chunk_size for job in jobs)
+    assert [record for job in jobs for record in job.records] == records
+    assert sink.records_to_drain == []
+
+
+@pytest.mark.parametrize("chunk_size", [0, -1])
+def test_streaming_insert_rejects_invalid_chunk_size(chunk_size: int):
+    target = TargetBigQuery(
+        config={
+            "project": "project",
+            "dataset": "dataset",
+            "options": {"streaming_insert_chunk_size": chunk_size},
+        }
+    )
+    with pytest.raises(ValueError, match="streaming_insert_chunk_size"):
+        BigQueryStreamingInsertSink(target, "stream", {"properties": {}}, None)
+
+
+def test_storage_write_splits_batch_by_request_size(monkeypatch):
+    monkeypatch.setattr("target_bigquery.storage_write.MAX_REQUEST_SIZE", 200)
+    queue = Queue()
+    sink = bare_sink(
+        BigQueryStorageWriteSink,
+        max_jobs_queued=100,
+        global_queue=queue,
+        increment_jobs_enqueued=lambda: None,
+        parent="parent",
+        template=None,
+        stream_notifier=None,
+        _proto_schema=struct_pb2.Struct,
+        proto_rows=types.ProtoRows(),
+        proto_rows_size=0,
+    )
+    records = [{"data": "x" * 40} for _ in range(10)]
+    records.insert(5, {"data": "y" * 500})
+    for record in records:
+        sink.process_record(record, {})
+    sink.process_batch({})
+
+    jobs = list(queue.queue)
+    rows = [row for job in jobs for row in job.data.serialized_rows]
+    assert len(jobs) > 2
+    assert [struct_pb2.Struct.FromString(row)["data"] for row in rows] == [
+        record["data"] for record in records
+    ]
+    for job in jobs:
+        size = sum(len(row) for row in job.data.serialized_rows)
+        assert size <= 200 or len(job.data.serialized_rows) == 1
+    # The oversized row goes out alone rather than looping or being merged
+    oversized = [job for job in jobs if b"y" * 500 in b"".join(job.data.serialized_rows)]
+    assert len(oversized) == 1 and len(oversized[0].data.serialized_rows) == 1
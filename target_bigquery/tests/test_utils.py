@@ -1,10 +1,14 @@
+import gc
+import gzip
+import threading
+import weakref
 from typing import List
 
 import pytest
 import singer_sdk.typing as th
 from google.cloud.bigquery import SchemaField
 
-from target_bigquery.core import SchemaTranslator, bigquery_type, transform_column_name, BigQueryTable, IngestionStrategy
+from target_bigquery.core import SchemaTranslator, bigquery_type, transform_column_name, BigQueryTable, IngestionStrategy, Compressor
 from target_bigquery.proto_gen import proto_schema_factory_v2
 
 
@@ -80,11 +84,21 @@ def test_transform_column_name(name: str, rules: dict, expected: str):
         ("number", None, "float"),
         ("string", "date-time", "timestamp"),
         ("number", "time", "time"),
+        (["null", "integer"], None, "integer"),
+        (["integer", "string"], None, "string"),
+        (["number", "integer", "string"], None, "float"),
+        (["null", "object"], None, "record"),
+        (["null", "string"], "uri", "string"),
     ],
     ids=[
         "number_to_float",
         "datetime_format_in_jsonschema",
         "time_format_in_jsonschema",
+        "nullable_integer",
+        "integer_or_string_to_string",
+        "number_takes_priority",
+        "nullable_object_to_record",
+        "unknown_format_falls_back_to_type",
     ],
 )
 def test_bigquery_type(jsonschema_type: str, jsonschema_format: str, expected: str):
@@ -701,3 +715,60 @@ def test_jit_compile_proto():
         == b"\x08\x01\x12\x04test\x19\x00\x00\x00\x00\x00\x00\xf0?"
         b" \x01*\n2020-01-012\n2020-01-01:\x0800:00:00"
     )
+
+
+def test_compressor_coalesced_writes():
+    compressor = Compressor()
+    lines = [b'{"id": %d}\n' % i for i in range(100_000)]
+    for line in lines:
+        compressor.write(line)
+    assert gzip.decompress(compressor.getvalue()) == b"".join(lines)
+
+
+def test_compressor_gzipfile_fallback(monkeypatch):
+    monkeypatch.setattr("target_bigquery.core.shutil.which", lambda _: None)
+    compressor = Compressor()
+    assert compressor._compressor is None
+    lines = [b'{"id": %d}\n' % i for i in range(100_000)]
+    for line in lines:
+        compressor.write(line)
+    compressor.flush()
+    assert gzip.decompress(bytes(compressor.getbuffer())) == b"".join(lines)
+
+
+class FailingStream:
+    def write(self, data: bytes) -> int:
+        raise OSError("broken pipe")
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.mark.parametrize("method", ["flush", "close"])
+def test_compressor_raises_writer_errors(method: str):
+    compressor = Compressor()
+    compressor._gzip = FailingStream()
+    compressor.write(b"data")
+    with pytest.raises(OSError, match="broken pipe"):
+        getattr(compressor, method)()
+    if method == "flush":
+        with pytest.raises(OSError, match="broken pipe"):
+            compressor.close()
+    assert not compressor._writer.is_alive()
+
+
+def test_compressor_is_collected_when_unclosed():
+    threads = threading.active_count()
+    compressors = [Compressor() for _ in range(20)]
+    for compressor in compressors:
+        compressor.write(b"x" * Compressor.FLUSH_THRESHOLD)
+    processes = [compressor._compressor for compressor in compressors]
+    refs = [weakref.ref(compressor) for compressor in compressors]
+    del compressor, compressors
+    gc.collect()
+    assert all(ref() is None for ref in refs)
+    assert threading.active_count() == threads
+    assert all(process.poll() is not None for process in processes)